@@ -0,0 +1,72 @@
+"""
+Benchmark: fuzzy phrase matching vs the hashed n-gram intent classifier
+
+Compares accuracy and throughput of the two `match_intent` backends on the labelled
+utterances in `data/intent_utterances.tsv`. Classifier accuracy is cross-validated: each
+fold is scored by a classifier trained on the phrase catalog and the other folds.
+
+Usage:
+    Run from the repository root.
+    Example: `python -m benchmarks.bench_intent`
+"""
+
+import time
+
+import numpy as np
+
+from utils.intent_classifier import IntentClassifier, catalog_examples, load_utterances
+from utils.match_intent import fuzzy_match_intent
+
+FOLDS = 5
+THROUGHPUT_UTTERANCES = 10000
+
+
+def accuracy(predicted, expected):
+    return sum(p == e for p, e in zip(predicted, expected)) / len(expected)
+
+
+if __name__ == "__main__":
+    examples = load_utterances()
+    texts = [text for _, text in examples]
+    labels = [intent for intent, _ in examples]
+
+    # Accuracy
+    fuzzy_predictions = [fuzzy_match_intent(text) for text in texts]
+
+    classifier_predictions = [None] * len(examples)
+    order = np.random.default_rng(1).permutation(len(examples))
+    start = time.perf_counter()
+    for fold in range(FOLDS):
+        held_out = sorted(order[fold::FOLDS].tolist())
+        training = [example for i, example in enumerate(examples) if i not in held_out]
+        classifier = IntentClassifier().calibrate(catalog_examples() + training)
+        for i, intent in zip(held_out, classifier.predict([texts[i] for i in held_out])):
+            classifier_predictions[i] = intent
+    training_seconds = (time.perf_counter() - start) / FOLDS
+
+    print(f"Utterances: {len(examples)}")
+    print(f"Fuzzy accuracy:      {accuracy(fuzzy_predictions, labels):.1%}")
+    print(f"Classifier accuracy: {accuracy(classifier_predictions, labels):.1%} ({FOLDS}-fold)")
+    print(f"Classifier training and calibration: {training_seconds:.2f}s")
+
+    # Throughput
+    batch = (texts * (THROUGHPUT_UTTERANCES // len(texts) + 1))[:THROUGHPUT_UTTERANCES]
+    classifier = IntentClassifier().calibrate(catalog_examples() + examples)
+
+    start = time.perf_counter()
+    for text in batch:
+        fuzzy_match_intent(text)
+    fuzzy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classifier.predict(batch)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in batch[:1000]:
+        classifier.predict([text])
+    single_seconds = (time.perf_counter() - start) * len(batch) / 1000
+
+    print(f"Fuzzy:                   {len(batch) / fuzzy_seconds:10.0f} utterances/s")
+    print(f"Classifier (one batch):  {len(batch) / batch_seconds:10.0f} utterances/s")
+    print(f"Classifier (one by one): {len(batch) / single_seconds:10.0f} utterances/s")
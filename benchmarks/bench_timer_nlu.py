@@ -0,0 +1,46 @@
+"""
+Benchmark: end-to-end NLU latency of timer commands
+
+Times `match_intent` followed by slot extraction with the timer grammar for set and stop
+timer commands, the whole path those intents take before a timer is started or stopped.
+
+Usage:
+    Run from the repository root.
+    Example: `python -m benchmarks.bench_timer_nlu`
+"""
+
+import time
+
+from utils.match_intent import match_intent
+from utils.timer_grammar import parse_timer_command
+
+REPEATS = 2000
+
+UTTERANCES = [
+    "set a timer for 5 minutes",
+    "set a timer for 1 hour 30 minutes",
+    "start a timer for an hour and a half",
+    "set a timer for ninety seconds",
+    "set a pasta timer for twenty five minutes",
+    "start a timer called laundry for 40 minutes",
+    "make a timer for three quarters of an hour",
+    "stop the pasta timer",
+    "cancel all timers",
+    "stop",
+]
+
+
+if __name__ == "__main__":
+    for text in UTTERANCES:
+        latencies = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            intent = match_intent(text)
+            slots = parse_timer_command(text)
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        mean = sum(latencies) / len(latencies)
+        p99 = latencies[int(len(latencies) * 0.99)]
+        print(f"{text:45} {intent:10} time={slots['time']!s:6} name={slots['name']!s:8} "
+              f"mean={mean * 1e6:6.1f}us p99={p99 * 1e6:6.1f}us")
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta, datetime
 
 import dateparser
@@ -6,10 +7,46 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+from utils.prefetch import prefetches
+from utils.profiling import profiled
 from utils.utils import nlp
 
 
-def add_task_to_google_calendar(data, duration_minutes=60, timezone="America/Los_Angeles"):
+# Only prefetch once authorized: the first run opens a browser, which must not start in the
+# background before we know the command is valid
+@prefetches("add_calendar", "service", when=lambda: os.path.exists('token.json'))
+def get_calendar_service():
+    """
+    Authorizes with Google and builds a Google Calendar API client.
+
+    Runs the local OAuth flow and saves the token only if no saved token exists yet.
+
+    Returns:
+        googleapiclient.discovery.Resource: The Google Calendar API client.
+    """
+    SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+    # Use flow.run_local_server() only if you haven't already authorized
+    flow = InstalledAppFlow.from_client_secrets_file(
+        '/Users/26slomianyjt/Desktop/MyCode/SpeechRecognition/credentials.json',
+        SCOPES
+    )
+
+    # Load or create credentials
+    try:
+        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    except FileNotFoundError:
+        creds = flow.run_local_server(port=0)
+
+        # Save the credentials for the next run
+        with open('token.json', 'w') as token:
+            token.write(creds.to_json())
+
+    return build('calendar', 'v3', credentials=creds)
+
+
+@profiled("add_calendar")
+def add_task_to_google_calendar(data, duration_minutes=60, timezone="America/Los_Angeles", prefetch=None):
     """
     Extracts event details from a string and adds the task to Google Calendar.
 
@@ -17,37 +54,24 @@ def add_task_to_google_calendar(data, duration_minutes=60, timezone="America/Los
         data (dict): Input string containing event details.
         duration_minutes (int): Duration of the event in minutes. Default is 60.
         timezone (str): Timezone for the event. Default is America/Los_Angeles.
+        prefetch (Prefetch): Service calls started when the intent was matched, if any.
 
     Returns:
         str: Success or error message.
     """
     try:
-        SCOPES = ["https://www.googleapis.com/auth/calendar"]
-
-        # Use flow.run_local_server() only if you haven't already authorized
-        flow = InstalledAppFlow.from_client_secrets_file(
-            '/Users/26slomianyjt/Desktop/MyCode/SpeechRecognition/credentials.json',
-            SCOPES
-        )
-
-        # Load or create credentials
-        try:
-            creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-        except FileNotFoundError:
-            creds = flow.run_local_server(port=0)
-
-            # Save the credentials for the next run
-            with open('token.json', 'w') as token:
-                token.write(creds.to_json())
-
-        service = build('calendar', 'v3', credentials=creds)
-
         # Extract event details using NLP function
         extracted_details = data
 
         if not extracted_details['date_time']:
             return "Error: Could not parse a valid datetime from the input text."
 
+        # Join the client that was set up while the event details were being parsed
+        if prefetch:
+            service = prefetch.get("service", get_calendar_service)
+        else:
+            service = get_calendar_service()
+
         # Define start and end times
         start_datetime = datetime.fromisoformat(extracted_details['date_time'])
 
@@ -79,6 +103,7 @@ def add_task_to_google_calendar(data, duration_minutes=60, timezone="America/Los
         return f"Error adding task: {e}"
 
 
+@profiled("add_calendar")
 def extract_event_datetime_google_format(text, timezone="UTC"):
     """
     Extracts the event name and datetime from a given string and formats the date for Google Calendar.
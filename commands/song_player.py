@@ -2,6 +2,8 @@ import os
 import spotipy
 from dotenv import load_dotenv
 from spotipy import SpotifyOAuth
+from utils.prefetch import prefetches
+from utils.profiling import profiled
 from utils.utils import nlp
 
 load_dotenv()
@@ -17,7 +19,22 @@ sp = spotipy.Spotify(
                               redirect_uri=REDIRECT_URI))
 
 
-def play_song_on_spotify(song_data):
+@prefetches("play_song", "device_id")
+def get_active_device_id():
+    """
+    Looks up the user's first available Spotify device.
+
+    Returns:
+        str: The device ID, or None if no device is available.
+    """
+    devices = sp.devices()
+    if devices["devices"]:
+        return devices["devices"][0]["id"]
+    return None
+
+
+@profiled("play_song")
+def play_song_on_spotify(song_data, prefetch=None):
     """
     Searches for a song on Spotify by name and artist, and starts playing it on an active device.
 
@@ -26,6 +43,7 @@ def play_song_on_spotify(song_data):
 
     Args:
         song_data (dict): A dictionary containing the song's name under the key 'song' and the artist's name under the key 'artist'.
+        prefetch (Prefetch): Service calls started when the intent was matched, if any.
 
     Returns:
         str: A message indicating the result. Either a success message with the song details or an error message.
@@ -51,11 +69,12 @@ def play_song_on_spotify(song_data):
             track = results["tracks"]["items"][0]
             track_uri = track["uri"]
 
-            # Get user's active device
-            devices = sp.devices()
-            if devices["devices"]:
-                device_id = devices["devices"][0]["id"]
-
+            # Get user's active device, already looked up while the song was being extracted
+            if prefetch:
+                device_id = prefetch.get("device_id", get_active_device_id)
+            else:
+                device_id = get_active_device_id()
+            if device_id:
                 # Start playback on the active device
                 sp.add_to_queue(device_id=device_id, uri=track_uri)
                 sp.next_track(device_id=device_id)
@@ -70,6 +89,7 @@ def play_song_on_spotify(song_data):
         print(f"An error occurred: {e}")
 
 
+@profiled("play_song")
 def extract_song_and_artist(text):
     """
     Extracts the song name and artist from a given text string.
@@ -1,51 +1,55 @@
-import re
-from ui.ui_components import TimerWindow, TimerWorker
+from ui.ui_components import TimerPanel
+from utils.profiling import profiled
+from utils.timer_grammar import parse_timer_command
 
+@profiled("set_timer")
 def extract_timer_details(text):
     """
-    Extracts the duration of a timer from a user's text input.
+    Extracts the duration and name of a timer from a user's text input.
 
-    This function uses regular expressions to search for time-related keywords like
-    "minutes", "hours", or "seconds" and converts them into a numeric value representing
-    the time in seconds.
+    This function uses the compiled timer grammar, which reads compound and worded durations
+    such as "1 hour 30 minutes", "an hour and a half" or "ninety seconds" in a single pass,
+    and converts them into a numeric value representing the time in seconds.
 
     Args:
         text (str): The text input provided by the user, potentially containing a time duration.
 
     Returns:
-        dict: A dictionary containing the extracted time in seconds under the key "time".
-              If no time is found, returns {"time": None}.
+        dict: A dictionary containing the extracted time in seconds under the key "time",
+              and the timer's name (e.g. "pasta" in "set a pasta timer") under the key "name".
+              If no time is found, "time" is None.
     """
-    # Search for time patterns like "5 minutes", "1 hour", "30 seconds"
-    time_match = re.search(r'(\d+)\s*(minute|hour|second|minute[s]?)?', text)
+    details = parse_timer_command(text)
+    return {"time": details["time"], "name": details["name"]}
 
-    if time_match:
-        # Extract the numeric value
-        time_value = int(time_match.group(1))  # This is the number (e.g., 5 from "5-minute")
 
-        # Get the unit (minute, hour, second) and convert to seconds
-        unit = time_match.group(2)
-        if unit in ['minute', 'minutes']:
-            time_value *= 60  # Convert minutes to seconds
-        elif unit in ['hour', 'hours']:
-            time_value *= 3600  # Convert hours to seconds
-        elif unit in ['second', 'seconds']:
-            time_value *= 1  # No conversion needed for seconds
+@profiled("stop_timer")
+def extract_stop_timer_details(text):
+    """
+    Extracts which timers a stop command refers to.
 
-        return {"time": time_value}
-    else:
-        return {"time": None}  # If no time found, return None
+    Args:
+        text (str): The text input provided by the user, e.g. "stop the pasta timer".
+
+    Returns:
+        dict: A dictionary containing the timer's name under the key "name" (None if no name
+              was given) and whether every timer should be stopped under the key "all".
+    """
+    details = parse_timer_command(text)
+    return {"name": details["name"], "all": details["all"]}
 
 
+@profiled("set_timer")
 def start_timer(time_data):
     """
     Starts a timer based on the provided time data.
 
-    This function initializes a timer window, creates a worker to handle the timer countdown,
-    and connects the necessary signals to update the window and notify the user when the timer is complete.
+    This function adds the timer to the shared timer panel, which counts down every
+    active timer and emits `timer_done` when one completes.
 
     Args:
-        time_data (dict): A dictionary containing the key "time", which holds the duration in seconds.
+        time_data (dict): A dictionary containing the key "time", which holds the duration in seconds,
+                          and optionally the key "name", which holds the timer's name.
 
     Returns:
         str: A message indicating the status of the timer. If the timer duration is valid,
@@ -53,22 +57,7 @@ def start_timer(time_data):
              failure message indicating that the duration could not be understood.
     """
     if time_data.get("time"):
-        # Create the timer window in the main thread
-        timer_window = TimerWindow(time_data["time"])
-
-        # Create the timer worker thread
-        timer_worker = TimerWorker(time_data["time"])
-
-        # Connect signals to the appropriate slots in the TimerWindow
-        timer_worker.update_timer_signal.connect(timer_window.update_timer)
-        timer_worker.timer_done_signal.connect(timer_window.show_timer_done_message)
-
-        # Start the worker thread
-        timer_worker.start()
-
-        # Show the window
-        timer_window.show()
-
+        TimerPanel.instance().add_timer(time_data["time"], time_data.get("name"))
         return f"Timer set for {time_data['time']} seconds!"
     else:
         return "Sorry, I couldn't understand the timer duration."
@@ -1,12 +1,27 @@
+import time
+
 from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QApplication
 from PyQt5.QtCore import Qt, QThreadPool
-from ui.ui_components import SiriButton, TimerWindow, SpeechToTextWorker, TimerWorker, TimerThread
+from ui.ui_components import SiriButton, SpeechToTextWorker, TimerPanel
 from utils.utils import speak_out_loud
-from utils.match_intent import match_intent
-from commands.timer import extract_timer_details
+from utils.match_intent import match_intent, normalise_command, warm_up_intent_backend
+from utils.prefetch import start_prefetch
+from utils.profiling import profiled
+from utils.speech_to_text import STREAMING_ENABLED
+from utils.streaming import EarlyIntentDetector
+from utils.transcript_log import transcript_log
+from commands.timer import extract_timer_details, extract_stop_timer_details
 from commands.calendar import add_task_to_google_calendar, extract_event_datetime_google_format
 from commands.song_player import play_song_on_spotify, extract_song_and_artist
 
+# Slot extractors that can run speculatively on partial transcripts
+SLOT_EXTRACTORS = {
+    "play_song": extract_song_and_artist,
+    "set_timer": extract_timer_details,
+    "stop_timer": extract_stop_timer_details,
+    "add_calendar": extract_event_datetime_google_format,
+}
+
 class AssistantWindow(QMainWindow):
     """
     Main Window for the AI Assistant application.
@@ -17,6 +32,8 @@ class AssistantWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.threadpool = QThreadPool()
+        self.early_intent = None
+        warm_up_intent_backend()
 
         self.setWindowTitle("AI Assistant")
         self.setGeometry(100, 100, 100, 100)
@@ -34,7 +51,11 @@ class AssistantWindow(QMainWindow):
         container.setLayout(self.layout)
         self.setCentralWidget(container)
 
+        self.timer_panel = TimerPanel.instance()
+        self.timer_panel.timer_done.connect(self.on_timer_complete)
+
         QApplication.instance().aboutToQuit.connect(self.cleanup_timers)
+        QApplication.instance().aboutToQuit.connect(transcript_log.close)
 
     def move_to_bottom_right(self):
         screen = QApplication.primaryScreen()
@@ -43,41 +64,32 @@ class AssistantWindow(QMainWindow):
         y = screen_geometry.bottom() - self.height() - 50
         self.move(x, y)
 
-    def start_timer(self, time_in_seconds):
-        self.cleanup_timers()
-        self.timer_worker = TimerWorker(time_in_seconds)
-        self.timer_thread = TimerThread(self.timer_worker)
-
-        self.timer_worker.open_timer_window_signal.connect(self.open_timer_window)
-        self.timer_worker.update_timer_signal.connect(self.update_timer_display)
-        self.timer_worker.timer_done_signal.connect(self.on_timer_complete)
-
-        self.timer_thread.start()
-
-    def open_timer_window(self, time_in_seconds):
-        self.timer_window = TimerWindow(time_in_seconds)
-        self.timer_window.setWindowFlags(Qt.WindowStaysOnTopHint)
-        self.timer_window.show()
+    def start_timer(self, time_in_seconds, name=None):
+        self.timer_panel.add_timer(time_in_seconds, name)
 
-    def update_timer_display(self, remaining_time):
-        if hasattr(self, 'timer_window'):
-            self.timer_window.update_timer_label(remaining_time)
-
-    def on_timer_complete(self, message):
-        if hasattr(self, 'timer_window'):
-            self.timer_window.close()
+    def on_timer_complete(self, name):
+        # Runs on the GUI thread, so only queue the announcement instead of waiting for it
+        speak_out_loud(f"Your {name} timer is done." if name else "Timer complete!", wait=False)
 
     def start_listening(self):
         print("Starting listening...")  # Debug
         self.listen_button.start_pulsing()
         QApplication.processEvents()
-        worker = SpeechToTextWorker(self.on_listening_complete)
+        if STREAMING_ENABLED:
+            # Detect the intent from partial transcripts while the user is still speaking
+            self.early_intent = EarlyIntentDetector(SLOT_EXTRACTORS)
+            worker = SpeechToTextWorker(self.on_listening_complete, on_partial=self.early_intent.feed)
+        else:
+            worker = SpeechToTextWorker(self.on_listening_complete)
         self.threadpool.start(worker)
 
     def on_listening_complete(self, text):
         print(f"Listening complete: {text}")  # Debug
         self.listen_button.stop_pulsing()
-        self.process_command(text)
+        early_intent, self.early_intent = self.early_intent, None
+        if early_intent is not None and not text:
+            early_intent.cancel()
+        self.process_command(text, early_intent)
         self.start_listening()  # Continue listening
 
     def start_speaking(self, text):
@@ -86,44 +98,85 @@ class AssistantWindow(QMainWindow):
         speak_out_loud(text)
         self.listen_button.stop_pulsing()
 
-    def cleanup_timers(self):
+    def cleanup_timers(self, name=None):
         print("Cleaning up timers...")  # Debug
-        if hasattr(self, 'timer_thread') and self.timer_thread.isRunning():
-            if hasattr(self, 'timer_worker'):
-                self.timer_worker.stop_timer()
-            self.timer_thread.quit()
-            self.timer_thread.wait()
-
-        if hasattr(self, 'timer_window'):
-            self.timer_window.close()
+        self.timer_panel.stop_timers(name)
 
     def closeEvent(self, event):
         print("Window close event triggered")  # Debug
         self.cleanup_timers()
         event.accept()
 
-    def process_command(self, text):
-        if text and "can you" in text:
-            text = text.replace("can you", "")
+    @profiled()
+    def process_command(self, text, early_intent=None):
+        text = normalise_command(text)
         if text:
             print(f"Processing command: {text}")  # Debug
-            intent = match_intent(text)
-            if intent == "play_song":
-                song_data = extract_song_and_artist(text)
-                response = play_song_on_spotify(song_data)
-                self.start_speaking(response)
-            elif intent == "set_timer":
-                time_data = extract_timer_details(text)
-                time = time_data["time"]
-                if time:
-                    self.start_timer(time)
-            elif intent == "stop_timer":
-                self.cleanup_timers()
-                self.start_speaking("Timers stopped.")
-            elif intent == "add_calendar":
-                calendar_data = extract_event_datetime_google_format(text)
-                response = add_task_to_google_calendar(calendar_data)
-                print(response)
-                self.start_speaking(response)
+            started = time.perf_counter()
+            if early_intent is not None:
+                # The final transcript confirms or corrects the work started on partials
+                intent, slots, prefetch = early_intent.confirm(text)
             else:
-                self.start_speaking("Sorry, I didn't understand that command.")
+                intent = match_intent(text)
+                slots = None
+
+                # Start the intent's service calls now so they overlap with slot extraction
+                prefetch = start_prefetch(intent)
+            try:
+                slots, response = self.handle_intent(intent, text, prefetch, slots)
+            except Exception:
+                prefetch.cancel()
+                raise
+
+            transcript_log.log(
+                utterance=text,
+                intent=intent,
+                slots=slots,
+                latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                outcome=response,
+            )
+            if response:
+                self.start_speaking(response)
+
+    @profiled(lambda self, intent, text, prefetch, slots=None: intent)
+    def handle_intent(self, intent, text, prefetch, slots=None):
+        """
+        Extracts the slots for an intent and carries out the command.
+
+        Args:
+            intent (str): The matched intent.
+            text (str): The user's command.
+            prefetch (Prefetch): Service calls started for the intent.
+            slots (dict): Slots already extracted from a partial transcript, if any.
+
+        Returns:
+            tuple: The slots used and the response to speak (None if there is nothing to say).
+        """
+        if intent == "play_song":
+            slots = slots or extract_song_and_artist(text)
+            if not slots["song"]:
+                prefetch.cancel()
+                return slots, "Sorry, I couldn't tell which song you want."
+            return slots, play_song_on_spotify(slots, prefetch=prefetch)
+        elif intent == "set_timer":
+            slots = slots or extract_timer_details(text)
+            if slots["time"]:
+                self.start_timer(slots["time"], slots["name"])
+            return slots, None
+        elif intent == "stop_timer":
+            slots = slots or extract_stop_timer_details(text)
+            name = None if slots["all"] else slots["name"]
+            if name and not self.timer_panel.has_timer(name):
+                return slots, f"There is no {name} timer."
+            self.cleanup_timers(name)
+            return slots, f"{name.capitalize()} timer stopped." if name else "Timers stopped."
+        elif intent == "add_calendar":
+            slots = slots or extract_event_datetime_google_format(text)
+            if not slots["date_time"]:
+                prefetch.cancel()
+                return slots, "Error: Could not parse a valid datetime from the input text."
+            response = add_task_to_google_calendar(slots, prefetch=prefetch)
+            print(response)
+            return slots, response
+        else:
+            return None, "Sorry, I didn't understand that command."
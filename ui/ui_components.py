@@ -1,8 +1,13 @@
-from PyQt5.QtWidgets import QPushButton, QLabel, QVBoxLayout, QMainWindow, QWidget
-from PyQt5.QtCore import QTimer, Qt, QRunnable, pyqtSlot, QThread, pyqtSignal, QObject
+import bisect
+import math
+import time
+from array import array
+
+from PyQt5.QtWidgets import QPushButton, QListView, QVBoxLayout, QWidget
+from PyQt5.QtCore import QTimer, Qt, QRunnable, pyqtSlot, pyqtSignal, QAbstractListModel, QModelIndex, QPoint
 from PyQt5.QtGui import QPainter, QColor, QBrush, QPainterPath, QFont
 
-from utils.speech_to_text import record_text
+from utils.speech_to_text import record_text, record_text_streaming
 
 
 class SiriButton(QPushButton):
@@ -85,124 +90,248 @@ class SiriButton(QPushButton):
             painter.drawEllipse(center, self.ripple_radius, self.ripple_radius)
 
 
-class TimerWindow(QMainWindow):
+class TimerListModel(QAbstractListModel):
     """
-    A window that displays a countdown timer.
+    List model holding every active timer in compact parallel arrays, ordered by deadline.
     """
-    timer_closed = pyqtSignal()  # Signal emitted when the window is closed
 
-    def __init__(self, time_in_seconds):
+    def __init__(self, parent=None):
         """
-        Initializes the TimerWindow.
+        Initializes the TimerListModel.
 
         Args:
-            time_in_seconds (int): The duration of the timer in seconds.
+            parent (QObject): The parent object, if any.
         """
-        super().__init__()
-        self.setWindowTitle("Timer")
-        self.setGeometry(100, 100, 200, 100)  # Position the window at the bottom-left of the screen
-        self.setWindowFlags(Qt.WindowStaysOnTopHint)
-
-        self.timer_label = QLabel(self)
-        self.timer_label.setAlignment(Qt.AlignCenter)
-
-        font = QFont()
-        font.setPointSize(48)
-        font.setBold(True)
-        self.timer_label.setFont(font)
+        super().__init__(parent)
+        self._deadlines = array("d")  # time.monotonic() deadlines, soonest first
+        self._names = []
+        self._now = time.monotonic()
 
-        layout = QVBoxLayout()
-        layout.addWidget(self.timer_label)
-        container = QWidget()
-        container.setLayout(layout)
-        self.setCentralWidget(container)
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Returns the number of active timers.
+        """
+        return 0 if parent.isValid() else len(self._deadlines)
 
-    def update_timer_label(self, remaining_time):
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the name and remaining time of a timer, as of the last tick.
         """
-        Updates the timer display with the remaining time.
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        remaining = max(0, math.ceil(self._deadlines[index.row()] - self._now))
+        hours, rest = divmod(remaining, 3600)
+        minutes, seconds = divmod(rest, 60)
+        clock = f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+        name = self._names[index.row()]
+        return f"{name}  {clock}" if name else clock
+
+    def add_timer(self, time_in_seconds, name=None):
+        """
+        Adds a timer, keeping the rows ordered by deadline.
 
         Args:
-            remaining_time (int): The remaining time in seconds.
+            time_in_seconds (int): The duration of the timer in seconds.
+            name (str): The timer's name, if any.
         """
-        minutes, seconds = divmod(int(remaining_time), 60)
-        self.timer_label.setText(f"{minutes:02d}:{seconds:02d}")
+        self._now = time.monotonic()
+        deadline = self._now + time_in_seconds
+        row = bisect.bisect_right(self._deadlines, deadline)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._deadlines.insert(row, deadline)
+        self._names.insert(row, name)
+        self.endInsertRows()
+
+    def has_timer(self, name):
+        """
+        Checks whether a timer with the given name is running.
 
-    def closeEvent(self, event):
+        Args:
+            name (str): The timer's name.
+
+        Returns:
+            bool: True if such a timer is running.
         """
-        Handles the window close event.
+        return name in self._names
 
-        Emits the `timer_closed` signal when the window is closed.
+    def remove_timers(self, name=None):
+        """
+        Removes the timers with a given name, or every timer.
 
         Args:
-            event (QCloseEvent): The close event instance.
+            name (str): The name of the timers to remove. Removes every timer if None.
+
+        Returns:
+            int: The number of timers removed.
         """
-        self.timer_closed.emit()
-        event.accept()
+        if name is None:
+            removed = len(self._deadlines)
+            self.beginResetModel()
+            del self._deadlines[:]
+            self._names.clear()
+            self.endResetModel()
+            return removed
+
+        removed = 0
+        for row in reversed(range(len(self._names))):
+            if self._names[row] == name:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._deadlines[row]
+                del self._names[row]
+                self.endRemoveRows()
+                removed += 1
+        return removed
+
+    def tick(self, first_row, last_row):
+        """
+        Advances the clock, removes finished timers and refreshes the given rows in one update.
 
+        Args:
+            first_row (int): The first visible row.
+            last_row (int): The last visible row.
 
-class TimerWorker(QObject):
+        Returns:
+            list: The names of the timers that finished (None for unnamed timers).
+        """
+        self._now = time.monotonic()
+
+        # Rows are ordered by deadline, so the finished timers are the first rows
+        finished = bisect.bisect_right(self._deadlines, self._now)
+        done = self._names[:finished]
+        if finished:
+            self.beginRemoveRows(QModelIndex(), 0, finished - 1)
+            del self._deadlines[:finished]
+            del self._names[:finished]
+            self.endRemoveRows()
+            first_row = max(0, first_row - finished)
+            last_row -= finished
+
+        last_row = min(last_row, len(self._deadlines) - 1)
+        if first_row <= last_row:
+            self.dataChanged.emit(self.index(first_row), self.index(last_row), [Qt.DisplayRole])
+        return done
+
+
+class TimerPanel(QWidget):
     """
-    Handles the logic for a countdown timer in a background thread.
+    A single window listing every active timer.
+
+    One display tick refreshes only the visible rows, however many timers are running.
+    Timers can be added and stopped from any thread; the changes are applied in the GUI thread.
     """
-    update_timer_signal = pyqtSignal(int)  # Signal to update the timer
-    timer_done_signal = pyqtSignal(str)   # Signal emitted when the timer completes
-    open_timer_window_signal = pyqtSignal(int)  # Signal to open the timer window
+    timer_done = pyqtSignal(str)  # Signal emitted with the timer's name ("" if unnamed) when it finishes
+    _add_requested = pyqtSignal(int, object)
+    _stop_requested = pyqtSignal(object)
 
-    def __init__(self, time_in_seconds):
+    _instance = None
+
+    @classmethod
+    def instance(cls):
         """
-        Initializes the TimerWorker.
+        Returns the shared timer panel, creating it on first use.
 
-        Args:
-            time_in_seconds (int): The duration of the timer in seconds.
+        Returns:
+            TimerPanel: The shared timer panel.
         """
-        super().__init__()
-        self.time_in_seconds = time_in_seconds
-        self.is_running = True
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
 
-    @pyqtSlot()
-    def start_timer(self):
+    def __init__(self, tick_ms=500):
         """
-        Starts the countdown timer and emits signals during the countdown.
+        Initializes the TimerPanel.
+
+        Args:
+            tick_ms (int): Milliseconds between display ticks.
         """
-        self.open_timer_window_signal.emit(self.time_in_seconds)
+        super().__init__()
+        self.setWindowTitle("Timers")
+        self.setGeometry(100, 100, 240, 160)
+        self.setWindowFlags(Qt.WindowStaysOnTopHint)
+
+        self.model = TimerListModel(self)
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)  # Lets the view skip measuring every row
 
-        while self.time_in_seconds > 0 and self.is_running:
-            QThread.msleep(1000)
-            self.time_in_seconds -= 1
-            self.update_timer_signal.emit(self.time_in_seconds)
+        font = QFont()
+        font.setPointSize(18)
+        font.setBold(True)
+        self.view.setFont(font)
 
-        if self.is_running:
-            self.timer_done_signal.emit("Timer Complete!")
-            self.is_running = False
+        layout = QVBoxLayout()
+        layout.addWidget(self.view)
+        self.setLayout(layout)
 
-    @pyqtSlot()
-    def stop_timer(self):
+        self.tick_timer = QTimer(self)
+        self.tick_timer.setInterval(tick_ms)
+        self.tick_timer.timeout.connect(self.tick)
+
+        # Queued automatically when emitted from another thread
+        self._add_requested.connect(self._add_timer)
+        self._stop_requested.connect(self._stop_timers)
+
+    def add_timer(self, time_in_seconds, name=None):
         """
-        Stops the countdown timer.
+        Starts a timer and shows the panel.
+
+        Args:
+            time_in_seconds (int): The duration of the timer in seconds.
+            name (str): The timer's name, if any.
         """
-        self.is_running = False
+        self._add_requested.emit(time_in_seconds, name)
 
+    def stop_timers(self, name=None):
+        """
+        Stops the timers with a given name, or every timer.
 
-class TimerThread(QThread):
-    """
-    Thread class to run the TimerWorker in a separate thread.
-    """
+        Args:
+            name (str): The name of the timers to stop. Stops every timer if None.
+        """
+        self._stop_requested.emit(name)
 
-    def __init__(self, timer_worker):
+    def has_timer(self, name):
         """
-        Initializes the TimerThread.
+        Checks whether a timer with the given name is running.
 
         Args:
-            timer_worker (TimerWorker): The TimerWorker instance to run in the thread.
+            name (str): The timer's name.
+
+        Returns:
+            bool: True if such a timer is running.
         """
-        super().__init__()
-        self.timer_worker = timer_worker
+        return self.model.has_timer(name)
+
+    @pyqtSlot(int, object)
+    def _add_timer(self, time_in_seconds, name):
+        self.model.add_timer(time_in_seconds, name)
+        if not self.tick_timer.isActive():
+            self.tick_timer.start()
+        self.show()
+
+    @pyqtSlot(object)
+    def _stop_timers(self, name):
+        self.model.remove_timers(name)
+        if self.model.rowCount() == 0:
+            self.tick_timer.stop()
+            self.hide()
 
-    def run(self):
+    @pyqtSlot()
+    def tick(self):
         """
-        Runs the TimerWorker's timer logic.
+        Refreshes the visible rows and reports finished timers.
         """
-        self.timer_worker.start_timer()
+        first = self.view.indexAt(QPoint(0, 0)).row()
+        last = self.view.indexAt(QPoint(0, self.view.viewport().height() - 1)).row()
+        if last < 0:
+            last = self.model.rowCount() - 1
+
+        for name in self.model.tick(max(first, 0), last):
+            self.timer_done.emit(name or "")
+
+        if self.model.rowCount() == 0:
+            self.tick_timer.stop()
+            self.hide()
 
 
 class SpeechToTextWorker(QRunnable):
@@ -210,20 +339,26 @@ class SpeechToTextWorker(QRunnable):
     Runnable class to handle speech-to-text functionality in a background thread.
     """
 
-    def __init__(self, callback):
+    def __init__(self, callback, on_partial=None):
         """
         Initializes the SpeechToTextWorker.
 
         Args:
             callback (function): The callback function to execute with the transcribed text.
+            on_partial (function): If given, speech is streamed and this is called with each
+                partial transcript while the user is speaking.
         """
         super().__init__()
         self.callback = callback
+        self.on_partial = on_partial
 
     @pyqtSlot()
     def run(self):
         """
         Executes the speech-to-text process and invokes the callback with the result.
         """
-        text = record_text()  # Run speech-to-text
+        if self.on_partial:
+            text = record_text_streaming(self.on_partial)
+        else:
+            text = record_text()  # Run speech-to-text
         self.callback(text)
@@ -0,0 +1,238 @@
+import functools
+import os
+import re
+import zlib
+
+import numpy as np
+
+from utils.match_intent import commands
+
+UTTERANCES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "intent_utterances.tsv"
+)
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def load_utterances(path=UTTERANCES_PATH):
+    """
+    Loads labelled utterances from a tab-separated file.
+
+    Args:
+        path (str): The file to read. Lines are `<intent><TAB><utterance>`; `#` starts a comment.
+
+    Returns:
+        list: (intent, utterance) pairs.
+    """
+    examples = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                intent, utterance = line.split("\t", 1)
+                examples.append((intent, utterance))
+    return examples
+
+
+def catalog_examples():
+    """
+    Turns the phrase catalog in `utils.match_intent.commands` into training examples.
+
+    Placeholders such as "[song]" are dropped, leaving the fixed words of each phrase.
+
+    Returns:
+        list: (intent, utterance) pairs.
+    """
+    return [
+        (intent, " ".join(re.sub(r"\[\w+\]", " ", phrase).split()))
+        for intent, phrases in commands.items()
+        for phrase in phrases
+    ]
+
+
+def _hashed_features(text, n_features):
+    """
+    Hashes the word unigrams, word bigrams and character 3-5 grams of a text.
+
+    crc32 is used instead of `hash` so that indices are stable between runs.
+
+    Args:
+        text (str): The text to featurise.
+        n_features (int): The number of hash buckets.
+
+    Returns:
+        list: The bucket index of every n-gram, with repeats.
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    grams = ["w:" + word for word in words]
+    grams += ["b:" + first + " " + second for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        for n in range(3, 6):
+            grams += ["c:" + padded[i:i + n] for i in range(len(padded) - n + 1)]
+    return [zlib.crc32(gram.encode()) % n_features for gram in grams]
+
+
+def vectorise(texts, n_features):
+    """
+    Builds the L2-normalised hashed n-gram matrix for a batch of texts.
+
+    Args:
+        texts (list): The texts to vectorise.
+        n_features (int): The number of hash buckets.
+
+    Returns:
+        np.ndarray: A float32 matrix of shape (len(texts), n_features).
+    """
+    X = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        np.add.at(X[row], _hashed_features(text, n_features), 1.0)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.maximum(norms, 1e-12)
+
+
+class IntentClassifier:
+    """
+    Linear softmax classifier over hashed character and word n-grams.
+
+    Predictions whose top probability falls below `threshold` are reported as "unknown".
+    """
+
+    def __init__(self, n_features=4096, epochs=300, learning_rate=2.0, l2=1e-4):
+        """
+        Initializes the IntentClassifier.
+
+        Args:
+            n_features (int): The number of hash buckets.
+            epochs (int): Full-batch gradient descent steps.
+            learning_rate (float): Gradient descent step size.
+            l2 (float): L2 regularisation strength.
+        """
+        self.n_features = n_features
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.intents = []
+        self.weights = None
+        self.bias = None
+        self.threshold = 0.0
+
+    def fit(self, examples):
+        """
+        Trains the classifier. Examples labelled "unknown" are ignored.
+
+        Args:
+            examples (list): (intent, utterance) pairs.
+
+        Returns:
+            IntentClassifier: The trained classifier.
+        """
+        examples = [(intent, text) for intent, text in examples if intent != "unknown"]
+        self.intents = sorted({intent for intent, _ in examples})
+        index = {intent: i for i, intent in enumerate(self.intents)}
+
+        X = vectorise([text for _, text in examples], self.n_features)
+        Y = np.zeros((len(examples), len(self.intents)), dtype=np.float32)
+        Y[np.arange(len(examples)), [index[intent] for intent, _ in examples]] = 1.0
+
+        self.weights = np.zeros((self.n_features, len(self.intents)), dtype=np.float32)
+        self.bias = np.zeros(len(self.intents), dtype=np.float32)
+        for _ in range(self.epochs):
+            error = (self._softmax(X @ self.weights + self.bias) - Y) / len(examples)
+            self.weights -= self.learning_rate * (X.T @ error + self.l2 * self.weights)
+            self.bias -= self.learning_rate * error.sum(axis=0)
+        return self
+
+    def calibrate(self, examples, folds=5, seed=0):
+        """
+        Picks the "unknown" threshold from cross-validated predictions, then trains on everything.
+
+        The threshold maximises the balanced accuracy of telling correctly classified known
+        utterances apart from "unknown" ones. Without "unknown" examples it keeps 95% of
+        correct known predictions.
+
+        Args:
+            examples (list): (intent, utterance) pairs, including "unknown" ones.
+            folds (int): Number of cross-validation folds.
+            seed (int): Seed for shuffling the folds.
+
+        Returns:
+            IntentClassifier: The trained and calibrated classifier.
+        """
+        order = np.random.default_rng(seed).permutation(len(examples))
+        known_scores = []
+        unknown_scores = []
+        for fold in range(folds):
+            held_out = set(order[fold::folds].tolist())
+            self.fit([example for i, example in enumerate(examples) if i not in held_out])
+            test = [examples[i] for i in sorted(held_out)]
+            probabilities = self.predict_proba([text for _, text in test])
+            for (intent, _), row in zip(test, probabilities):
+                if intent == "unknown":
+                    unknown_scores.append(row.max())
+                elif self.intents[row.argmax()] == intent:
+                    known_scores.append(row.max())
+
+        known_scores = np.array(known_scores)
+        unknown_scores = np.array(unknown_scores)
+        if len(unknown_scores) == 0:
+            self.threshold = float(np.percentile(known_scores, 5))
+        else:
+            candidates = np.unique(np.concatenate([known_scores, unknown_scores]))
+            balanced = [
+                (known_scores >= t).mean() + (unknown_scores < t).mean() for t in candidates
+            ]
+            self.threshold = float(candidates[int(np.argmax(balanced))])
+
+        threshold = self.threshold
+        self.fit(examples)
+        self.threshold = threshold
+        return self
+
+    @staticmethod
+    def _softmax(scores):
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts):
+        """
+        Scores a batch of texts with a single matrix multiply.
+
+        Args:
+            texts (list): The texts to score.
+
+        Returns:
+            np.ndarray: Probabilities of shape (len(texts), len(self.intents)).
+        """
+        return self._softmax(vectorise(texts, self.n_features) @ self.weights + self.bias)
+
+    def predict(self, texts):
+        """
+        Predicts the intent of each text in a batch.
+
+        Args:
+            texts (list): The texts to classify.
+
+        Returns:
+            list: The intent for each text, or "unknown" if the classifier is not confident.
+        """
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [
+            self.intents[i] if p >= self.threshold else "unknown"
+            for i, p in zip(best, probabilities[np.arange(len(texts)), best])
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def default_classifier():
+    """
+    Trains and calibrates the classifier on the phrase catalog and the labelled utterance file.
+
+    The result is cached, so training happens once per process.
+
+    Returns:
+        IntentClassifier: The trained classifier.
+    """
+    return IntentClassifier().calibrate(catalog_examples() + load_utterances())
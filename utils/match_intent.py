@@ -1,5 +1,9 @@
+import os
+
 from fuzzywuzzy import fuzz
 
+from utils.timer_grammar import match_timer_intent
+
 commands = {
     "add_calendar": ["add a meeting", "add to my calendar", "schedule a meeting", "add a task", "remind me to", "remind me to", ],
     "set_timer": ["set timer", "start a timer for", "make a timer", "timer for"],
@@ -7,8 +11,58 @@ commands = {
     "play_song": ["play", "play [song] by [artist]", "can you play [song] by [artist]", "can you play [song]"],
 }
 
+# Which matcher `match_intent` uses: "fuzzy" phrase matching or the trained "classifier"
+INTENT_BACKEND = os.getenv("ASSISTANT_INTENT_BACKEND", "fuzzy")
+
+
+def normalise_command(text):
+    """
+    Removes filler phrases that would otherwise end up in the extracted slots.
+
+    Args:
+        text (str): The transcribed text, or None if nothing was recognised.
+
+    Returns:
+        str: The cleaned text, or None if nothing was recognised.
+    """
+    if text and "can you" in text:
+        text = text.replace("can you", "")
+    return text
+
+
+def warm_up_intent_backend():
+    """
+    Trains the classifier now if it is the configured backend, so that the first command
+    (which may be matched on the audio capture thread) does not pay for training.
+    """
+    if INTENT_BACKEND == "classifier":
+        from utils.intent_classifier import default_classifier
+        default_classifier()
+
 
 def match_intent(user_text):
+    """
+    Matches a user's text input to a predefined intent using the configured backend.
+
+    Args:
+        user_text (str): The text input provided by the user.
+
+    Returns:
+        str: The intent that best matches the user's input, or "unknown" if no match is found.
+    """
+    # Timer commands are recognised by the timer grammar alone, which is much cheaper
+    timer_intent = match_timer_intent(user_text)
+    if timer_intent:
+        return timer_intent
+
+    if INTENT_BACKEND == "classifier":
+        # Imported here so that NumPy is only needed when the classifier is used
+        from utils.intent_classifier import default_classifier
+        return default_classifier().predict([user_text])[0]
+    return fuzzy_match_intent(user_text)
+
+
+def fuzzy_match_intent(user_text):
     """
     Matches a user's text input to a predefined intent using fuzzy string matching.
 
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared pool for speculative service calls. Calls are network bound, so a few threads
+# are enough to overlap them with NLP on the command thread.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+
+# Maps each intent to the independent service calls it needs: name -> (function, condition)
+_prefetchers = {}
+
+
+def prefetches(intent, name, when=None):
+    """
+    Decorator that registers a function as a service call to start as soon as an intent is matched.
+
+    The function must take no arguments, since it runs before any slots are extracted.
+
+    Args:
+        intent (str): The intent that needs the service call.
+        name (str): The name the handler uses to collect the result.
+        when (function): Called with no arguments when the intent is matched; the call is
+            only prefetched if it returns True. Always prefetched if None.
+
+    Returns:
+        function: The decorator, which returns the function unchanged.
+    """
+    def decorator(func):
+        _prefetchers.setdefault(intent, {})[name] = (func, when)
+        return func
+
+    return decorator
+
+
+class Prefetch:
+    """
+    The in-flight service calls for one command.
+    """
+
+    def __init__(self, futures):
+        """
+        Initializes the Prefetch.
+
+        Args:
+            futures (dict): Maps each service call name to its Future.
+        """
+        self.futures = futures
+        self.cancelled = False
+
+    def get(self, name, fallback):
+        """
+        Waits for a prefetched result, or calls the fallback if it was never started.
+
+        Args:
+            name (str): The name the service call was registered under.
+            fallback (function): Called with no arguments when there is no prefetched result.
+
+        Returns:
+            The result of the service call.
+
+        Raises:
+            Exception: Whatever the service call raised.
+        """
+        future = self.futures.get(name)
+        if future is None or self.cancelled:
+            return fallback()
+        return future.result()
+
+    def cancel(self):
+        """
+        Cancels the service calls that have not started yet and discards the rest.
+        """
+        self.cancelled = True
+        for future in self.futures.values():
+            future.cancel()
+
+
+def start_prefetch(intent):
+    """
+    Starts every service call registered for an intent concurrently.
+
+    Args:
+        intent (str): The matched intent.
+
+    Returns:
+        Prefetch: The in-flight calls. Empty if the intent has none registered.
+    """
+    futures = {
+        name: _executor.submit(func)
+        for name, (func, when) in _prefetchers.get(intent, {}).items()
+        if when is None or when()
+    }
+    return Prefetch(futures)
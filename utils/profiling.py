@@ -0,0 +1,235 @@
+import functools
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Profiling is switched on with ASSISTANT_PROFILE=1. When it is off the decorator below
+# returns the wrapped function untouched, so there is no overhead at all.
+PROFILE_ENABLED = os.getenv("ASSISTANT_PROFILE", "0").lower() in ("1", "true", "yes", "on")
+PROFILE_SAMPLE_RATE = float(os.getenv("ASSISTANT_PROFILE_SAMPLE_RATE", "0.1"))
+PROFILE_INTERVAL_MS = float(os.getenv("ASSISTANT_PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("ASSISTANT_PROFILE_KEEP", "20"))
+PROFILE_TOP_ALLOCATIONS = int(os.getenv("ASSISTANT_PROFILE_TOP_ALLOCATIONS", "25"))
+PROFILE_DIR = os.getenv(
+    "ASSISTANT_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles"),
+)
+
+# Per-thread profiling state: the sampling decision made by the outermost profiled call
+# (process_command -> handle_intent -> command handlers) and the command's intent.
+_state = threading.local()
+
+# tracemalloc is process-wide, so it is shared by the profiled calls running on all
+# threads: started by the first one and stopped when the last one finishes.
+_tracing_lock = threading.Lock()
+_tracing_calls = 0
+_started_tracing = False
+
+
+class _StackSampler(threading.Thread):
+    """
+    Background thread that periodically samples the call stack of another thread.
+    """
+
+    def __init__(self, thread_id, interval):
+        """
+        Initializes the _StackSampler.
+
+        Args:
+            thread_id (int): The ident of the thread to sample.
+            interval (float): The time between samples in seconds.
+        """
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """
+        Collects collapsed stacks until `stop` is called.
+        """
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+
+            # Collapsed stacks are written root first, frames separated by semicolons
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        """
+        Stops sampling and waits for the thread to finish.
+        """
+        self._stop_event.set()
+        self.join()
+
+
+def _rotate(directory, keep):
+    """
+    Deletes the oldest profiles in a directory so that at most `keep` remain.
+
+    Args:
+        directory (str): The directory holding the profiles for one intent.
+        keep (int): The number of profiles to keep.
+    """
+    # Every profile is a group of files sharing the same "<time_ns>-<name>" prefix
+    prefixes = sorted({name.split(".", 1)[0] for name in os.listdir(directory)})
+    for prefix in prefixes[:-keep] if keep > 0 else prefixes:
+        for name in os.listdir(directory):
+            if name.split(".", 1)[0] == prefix:
+                os.remove(os.path.join(directory, name))
+
+
+def _write_profile(key, name, stacks, allocation_stats):
+    """
+    Writes a collapsed-stack file and the top allocation sites for one profiled call.
+
+    Args:
+        key (str): The intent the profile belongs to, used as the directory name.
+        name (str): The name of the profiled function.
+        stacks (Counter): Sample counts for each collapsed stack.
+        allocation_stats (list): `tracemalloc.StatisticDiff` entries, largest first.
+    """
+    directory = os.path.join(PROFILE_DIR, key)
+    os.makedirs(directory, exist_ok=True)
+    prefix = os.path.join(directory, f"{time.time_ns()}-{name}")
+
+    # Compatible with flamegraph.pl, speedscope and other collapsed-stack viewers
+    with open(prefix + ".folded", "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    with open(prefix + ".alloc.txt", "w") as f:
+        for stat in allocation_stats[:PROFILE_TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
+
+    _rotate(directory, PROFILE_KEEP)
+
+
+def _save_profile(func, stacks, snapshot_before, snapshot_after):
+    # No intent means the call never got as far as a command, e.g. empty text
+    if _state.intent is None:
+        return
+
+    ignored = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    allocation_stats = snapshot_after.filter_traces(ignored).compare_to(
+        snapshot_before.filter_traces(ignored), "lineno"
+    )
+    try:
+        _write_profile(_state.intent, func.__qualname__, stacks, allocation_stats)
+    except OSError as e:
+        print(f"Could not write profile: {e}")
+
+
+def _start_tracing():
+    global _tracing_calls, _started_tracing
+    with _tracing_lock:
+        # Leave tracing alone if something outside the profiler already started it
+        if _tracing_calls == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_calls += 1
+
+
+def _stop_tracing():
+    global _tracing_calls, _started_tracing
+    with _tracing_lock:
+        _tracing_calls -= 1
+        if _tracing_calls == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _profile_call(func, args, kwargs):
+    """
+    Runs a function under the stack sampler and tracemalloc, then writes its profile.
+
+    The profile is written under the intent recorded in `_state.intent` once the call
+    returns, so nested profiled calls can name the intent after it has been matched.
+
+    Args:
+        func (function): The function to run.
+        args (tuple): Positional arguments for the function.
+        kwargs (dict): Keyword arguments for the function.
+
+    Returns:
+        The function's return value.
+    """
+    _start_tracing()
+    try:
+        # Started before the first snapshot, so the sampler's own allocations are not in the diff
+        sampler = _StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+        snapshot_before = tracemalloc.take_snapshot()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            snapshot_after = tracemalloc.take_snapshot()
+            sampler.stop()
+            _save_profile(func, sampler.stacks, snapshot_before, snapshot_after)
+    finally:
+        _stop_tracing()
+
+
+def _resolve(key, args, kwargs):
+    return key(*args, **kwargs) if callable(key) else key
+
+
+def profiled(key=None):
+    """
+    Decorator that profiles a sampled fraction of calls to the wrapped function.
+
+    Only the outermost profiled call on a thread is profiled: it decides whether to
+    sample, records CPU stacks with one background sampler and one `tracemalloc` diff,
+    and writes them to `PROFILE_DIR/<intent>/`. Nested profiled calls follow that
+    decision and only name the intent, if it is not known yet.
+
+    Args:
+        key (str or function): The intent name, or a function called with the same
+            arguments as the wrapped function that returns the intent name. None if a
+            nested profiled call names the intent (e.g. `process_command`).
+
+    Returns:
+        function: The decorator. It returns the function unchanged when profiling is off.
+    """
+    def decorator(func):
+        if not PROFILE_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            sampled = getattr(_state, "sampled", None)
+            if sampled is not None:
+                # Nested call: the first one with a key names the command's intent
+                if sampled and key is not None and _state.intent is None:
+                    _state.intent = _resolve(key, args, kwargs)
+                return func(*args, **kwargs)
+
+            _state.sampled = random.random() < PROFILE_SAMPLE_RATE
+            try:
+                if not _state.sampled:
+                    return func(*args, **kwargs)
+                _state.intent = _resolve(key, args, kwargs) if key is not None else None
+                return _profile_call(func, args, kwargs)
+            finally:
+                _state.sampled = None
+                _state.intent = None
+
+        return wrapper
+
+    return decorator
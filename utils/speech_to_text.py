@@ -2,12 +2,20 @@
 # speech to text and text to speech
 # https://www.geeksforgeeks.org/python-convert-speech-to-text-and-text-to-speech/#
 
+import os
+
 import speech_recognition as sr
 import pyttsx3
 
+from utils.streaming import MicrophoneStreamingSource
+from utils.transcript_log import transcript_log
+
 # Initialize the recognizer
 r = sr.Recognizer()
 
+# Emit partial transcripts while the user is speaking (ASSISTANT_STREAMING=1)
+STREAMING_ENABLED = os.getenv("ASSISTANT_STREAMING", "0").lower() in ("1", "true", "yes", "on")
+
 
 def record_text():
     """
@@ -52,16 +60,49 @@ def record_text():
             return None
 
 
-def output_text(text):
+def record_text_streaming(on_partial, source=None):
+    """
+    Captures user speech and reports partial transcripts until the phrase ends.
+
+    Args:
+        on_partial (function): Called with each partial transcript while the user is speaking.
+        source (iterable): A source of PartialTranscript values. Streams from the microphone if None.
+
+    Returns:
+        str: The final transcribed text if speech is successfully recognized.
+        None: If an error occurs or no speech is detected.
+    """
+    try:
+        for partial in source if source is not None else MicrophoneStreamingSource(r):
+            if partial.is_final:
+                return partial.text.lower()
+            on_partial(partial.text.lower())
+
+    except sr.WaitTimeoutError:
+        # Triggered when no audio is detected within the timeout period.
+        print("No audio detected within the timeout period.")
+    except sr.RequestError as e:
+        # API request failed.
+        print("Could not request results; {0}".format(e))
+    except sr.UnknownValueError:
+        # Speech was unintelligible.
+        print("Unknown error occurred.")
+    except Exception as e:
+        # Handle unexpected exceptions.
+        print(e)
+    return None
+
+
+def output_text(text, **fields):
     """
-    Outputs text to the console and appends it to a file.
+    Outputs text to the console and queues it for the transcript log.
 
     Args:
         text (str): The text to be written and displayed.
+        **fields: Extra fields for the log record, such as intent or outcome.
 
     Returns:
         None
     """
     print(text)
-    with open("../output.txt", "a") as f:
-        f.write(text + "\n")
\ No newline at end of file
+    transcript_log.log(utterance=text, **fields)
@@ -0,0 +1,290 @@
+import audioop
+import os
+import re
+import sys
+import time
+import wave
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+from utils.match_intent import match_intent, normalise_command
+from utils.prefetch import start_prefetch
+
+# A recognition hypothesis. Partial hypotheses may still change; the final one will not.
+PartialTranscript = namedtuple("PartialTranscript", ["text", "is_final"])
+
+# Runs speculative slot extraction off the capture thread, one extraction at a time
+_slot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slots")
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def _comparable(text):
+    """
+    Reduces a transcript to its lowercase words, so that re-recognising the same words
+    with different casing, punctuation or spacing still counts as the same transcript.
+    """
+    return " ".join(_WORD_PATTERN.findall(text.lower()))
+
+
+class MicrophoneStreamingSource:
+    """
+    Streams partial transcripts from the microphone while the user is still speaking.
+
+    Audio is read chunk by chunk. Every `partial_interval` seconds the audio captured so far
+    is sent for recognition in the background, and the phrase ends after `pause_threshold`
+    seconds of silence, when the full clip is recognised once more as the final transcript.
+    """
+
+    def __init__(self, recognizer, partial_interval=1.0, phrase_time_limit=30, timeout=4):
+        """
+        Initializes the MicrophoneStreamingSource.
+
+        Args:
+            recognizer (sr.Recognizer): The recognizer used for energy thresholds and recognition.
+            partial_interval (float): Seconds of audio between partial recognitions.
+            phrase_time_limit (float): Maximum length of a phrase in seconds.
+            timeout (float): Seconds to wait for speech to start.
+        """
+        self.recognizer = recognizer
+        self.partial_interval = partial_interval
+        self.phrase_time_limit = phrase_time_limit
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="partial-recognition")
+
+    def _recognize(self, frame_data, sample_rate, sample_width):
+        """
+        Recognises a partial clip, ignoring failures since a later hypothesis will replace it.
+
+        Returns:
+            str: The partial transcript, or None if nothing was recognised.
+        """
+        try:
+            return self.recognizer.recognize_google(sr.AudioData(frame_data, sample_rate, sample_width))
+        except (sr.UnknownValueError, sr.RequestError):
+            return None
+
+    def __iter__(self):
+        """
+        Yields partial transcripts as they are recognised, then the final transcript.
+
+        Raises:
+            sr.WaitTimeoutError: If no speech starts within the timeout.
+            sr.UnknownValueError: If the final clip is unintelligible.
+            sr.RequestError: If the final recognition request fails.
+        """
+        with sr.Microphone() as source:
+            # Adjust for ambient noise.
+            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            print("Say something!")
+
+            seconds_per_buffer = source.CHUNK / source.SAMPLE_RATE
+            frames = []
+            waited = 0
+            speaking = False
+            elapsed = 0
+            quiet = 0
+            since_partial = 0
+            pending = None
+
+            while True:
+                buffer = source.stream.read(source.CHUNK)
+                if not buffer:
+                    break
+                is_quiet = audioop.rms(buffer, source.SAMPLE_WIDTH) <= self.recognizer.energy_threshold
+
+                # Wait for the user to start speaking.
+                if not speaking:
+                    waited += seconds_per_buffer
+                    if is_quiet:
+                        if waited > self.timeout:
+                            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                        continue
+                    speaking = True
+
+                frames.append(buffer)
+                elapsed += seconds_per_buffer
+                since_partial += seconds_per_buffer
+                quiet = quiet + seconds_per_buffer if is_quiet else 0
+                if quiet >= self.recognizer.pause_threshold or elapsed >= self.phrase_time_limit:
+                    break
+
+                # Emit the previous partial once it is back, then start the next one.
+                if pending is not None and pending.done():
+                    text = pending.result()
+                    pending = None
+                    if text:
+                        yield PartialTranscript(text, False)
+                if pending is None and since_partial >= self.partial_interval:
+                    since_partial = 0
+                    pending = self._executor.submit(
+                        self._recognize, b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH
+                    )
+
+            audio = sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+        yield PartialTranscript(self.recognizer.recognize_google(audio), True)
+
+
+class WavStreamingSource:
+    """
+    Local streaming stand-in that replays a WAV fixture instead of using the microphone.
+
+    The transcript is read from a sidecar text file next to the WAV (`clip.wav` -> `clip.txt`)
+    and revealed word by word in proportion to how much of the audio has been read, so
+    partial transcripts arrive as they would from a real streaming recogniser.
+    """
+
+    def __init__(self, wav_path, transcript=None, chunk_ms=250, realtime=False):
+        """
+        Initializes the WavStreamingSource.
+
+        Args:
+            wav_path (str): Path to the WAV fixture.
+            transcript (str): The words spoken in the fixture. Read from the sidecar file if None.
+            chunk_ms (int): Milliseconds of audio read per step.
+            realtime (bool): Whether to sleep for the duration of each chunk.
+        """
+        self.wav_path = wav_path
+        if transcript is None:
+            with open(os.path.splitext(wav_path)[0] + ".txt") as f:
+                transcript = f.read()
+        self.words = transcript.split()
+        self.chunk_ms = chunk_ms
+        self.realtime = realtime
+
+    def __iter__(self):
+        """
+        Yields a partial transcript whenever another word is revealed, then the final transcript.
+        """
+        with wave.open(self.wav_path, "rb") as wav:
+            total_frames = wav.getnframes()
+            frames_per_chunk = max(1, wav.getframerate() * self.chunk_ms // 1000)
+            frames_read = 0
+            revealed = 0
+
+            while frames_read < total_frames:
+                chunk = wav.readframes(frames_per_chunk)
+                if not chunk:
+                    break
+                frames_read += len(chunk) // (wav.getsampwidth() * wav.getnchannels())
+                if self.realtime:
+                    time.sleep(self.chunk_ms / 1000)
+
+                words = len(self.words) * frames_read // total_frames
+                if words > revealed:
+                    revealed = words
+                    yield PartialTranscript(" ".join(self.words[:words]), False)
+
+        yield PartialTranscript(" ".join(self.words), True)
+
+
+class EarlyIntentDetector:
+    """
+    Matches intents on partial transcripts and starts work before the user stops speaking.
+
+    Once the same intent has been matched on `stable_after` consecutive partials, the
+    intent's service calls are prefetched and its slots are extracted speculatively from
+    each new partial. The final transcript then confirms or corrects that work.
+    """
+
+    def __init__(self, slot_extractors, stable_after=2):
+        """
+        Initializes the EarlyIntentDetector.
+
+        Args:
+            slot_extractors (dict): Maps each intent to a function extracting its slots from text.
+            stable_after (int): Number of consecutive partials that must agree on the intent.
+        """
+        self.slot_extractors = slot_extractors
+        self.stable_after = stable_after
+        self.intent = None
+        self.prefetch = None
+        self._candidate = None
+        self._agreeing = 0
+        self._last_text = None
+        self._slots = None  # (comparable text, Future) for the latest speculative extraction
+
+    def feed(self, text):
+        """
+        Matches the intent of a partial transcript.
+
+        Args:
+            text (str): The partial transcript.
+        """
+        text = normalise_command(text)
+        if not text or text == self._last_text:
+            return
+        self._last_text = text
+
+        intent = match_intent(text)
+        if self.intent is None:
+            if intent == self._candidate:
+                self._agreeing += 1
+            else:
+                self._candidate = intent
+                self._agreeing = 1
+
+            if intent != "unknown" and self._agreeing >= self.stable_after:
+                print(f"Early intent: {intent}")  # Debug
+                self.intent = intent
+                self.prefetch = start_prefetch(intent)
+
+        # Keep the speculative slots in step with the latest partial
+        if intent == self.intent and intent in self.slot_extractors:
+            if self._slots is not None:
+                self._slots[1].cancel()
+            self._slots = (_comparable(text), _slot_executor.submit(self.slot_extractors[intent], text))
+
+    def confirm(self, text):
+        """
+        Checks the early work against the final transcript.
+
+        The speculative slots are only reused if the final transcript has the same words as
+        the partial they were extracted from; otherwise they are extracted again.
+
+        Args:
+            text (str): The final transcript.
+
+        Returns:
+            tuple: The intent, the slots (None if they must be extracted from the final
+                transcript) and the Prefetch for the intent's service calls.
+        """
+        text = normalise_command(text)
+        intent = match_intent(text)
+        if intent != self.intent:
+            # The final transcript changed the intent, so start over
+            self.cancel()
+            return intent, None, start_prefetch(intent)
+
+        slots = None
+        if self._slots is not None and self._slots[0] == _comparable(text) and not self._slots[1].cancelled():
+            try:
+                slots = self._slots[1].result()
+            except Exception as e:
+                print(f"Speculative slot extraction failed: {e}")
+        return intent, slots, self.prefetch
+
+    def cancel(self):
+        """
+        Cancels the prefetched service calls and any pending slot extraction.
+        """
+        if self.prefetch is not None:
+            self.prefetch.cancel()
+        if self._slots is not None:
+            self._slots[1].cancel()
+
+
+if __name__ == "__main__":
+    # Replay a WAV fixture and show when the intent becomes stable.
+    # Example: `python -m utils.streaming utils/fixtures/set_timer.wav`
+    detector = EarlyIntentDetector({})
+    start = time.perf_counter()
+    for partial in WavStreamingSource(sys.argv[1], realtime=True):
+        if partial.is_final:
+            print(f"{time.perf_counter() - start:6.2f}s final: {partial.text} -> {detector.confirm(partial.text)[0]}")
+        else:
+            detector.feed(partial.text)
+            print(f"{time.perf_counter() - start:6.2f}s partial: {partial.text} (early intent: {detector.intent})")
@@ -0,0 +1,68 @@
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+from utils import profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "PROFILE_INTERVAL_MS", 1.0)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def allocation_report(directory):
+    (name,) = [name for name in os.listdir(directory) if name.endswith(".alloc.txt")]
+    with open(os.path.join(directory, name)) as f:
+        return f.read().splitlines()
+
+
+def test_overlapping_calls_on_two_threads_both_return(profile_dir):
+    second_started = threading.Event()
+    first_finished = threading.Event()
+
+    @profiling.profiled("first")
+    def first():
+        assert second_started.wait(5)
+        return "first"
+
+    @profiling.profiled("second")
+    def second():
+        second_started.set()
+        assert first_finished.wait(5)
+        return "second"
+
+    results = {}
+
+    def run(func):
+        results[func.__name__] = func()
+
+    threads = [threading.Thread(target=run, args=(func,)) for func in (first, second)]
+    threads[0].start()
+    threads[1].start()
+    threads[0].join()
+    # The call that started tracing has finished while the other is still running
+    assert tracemalloc.is_tracing()
+    first_finished.set()
+    threads[1].join()
+
+    assert results == {"first": "first", "second": "second"}
+    assert not tracemalloc.is_tracing()
+    assert sorted(os.listdir(profile_dir)) == ["first", "second"]
+
+
+def test_top_allocation_sites_belong_to_the_command(profile_dir):
+    @profiling.profiled("allocate")
+    def allocate():
+        return [[i] for i in range(200)]
+
+    allocate()
+
+    top = allocation_report(os.path.join(profile_dir, "allocate"))[0]
+    assert os.path.basename(__file__) in top
+    assert not any("threading.py" in line for line in allocation_report(os.path.join(profile_dir, "allocate")))
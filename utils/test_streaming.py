@@ -0,0 +1,72 @@
+import os
+
+from utils.speech_to_text import record_text_streaming
+from utils.streaming import EarlyIntentDetector, WavStreamingSource
+from utils.timer_grammar import parse_timer_command
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "set_timer.wav")
+
+
+def stream_fixture(detector):
+    """
+    Replays the fixture through record_text_streaming, recording the early intent after each partial.
+    """
+    partials = []
+
+    def on_partial(text):
+        detector.feed(text)
+        partials.append((text, detector.intent))
+
+    final = record_text_streaming(on_partial, source=WavStreamingSource(FIXTURE))
+    return partials, final
+
+
+def test_wav_source_reveals_words_then_final():
+    transcripts = list(WavStreamingSource(FIXTURE))
+    assert [t.text for t in transcripts if not t.is_final] == [
+        "Set", "Set a", "Set a timer", "Set a timer for", "Set a timer for five", "Set a timer for five minutes",
+    ]
+    assert transcripts[-1] == ("Set a timer for five minutes", True)
+
+
+def test_intent_stabilises_before_the_phrase_ends():
+    detector = EarlyIntentDetector({"set_timer": parse_timer_command})
+    partials, final = stream_fixture(detector)
+
+    assert final == "set a timer for five minutes"
+    stable_at = next(text for text, intent in partials if intent is not None)
+    assert stable_at == "set a timer"
+    assert all(intent == "set_timer" for _, intent in partials[partials.index((stable_at, "set_timer")):])
+
+    intent, slots, prefetch = detector.confirm(final)
+    assert intent == "set_timer"
+    assert slots["time"] == 300
+    assert prefetch is detector.prefetch
+
+
+def test_confirm_reuses_slots_when_only_casing_and_punctuation_differ():
+    detector = EarlyIntentDetector({"set_timer": parse_timer_command})
+    stream_fixture(detector)
+
+    _, slots, _ = detector.confirm("Set a timer, for five minutes.")
+    assert slots["time"] == 300
+
+
+def test_confirm_extracts_again_when_the_words_changed():
+    detector = EarlyIntentDetector({"set_timer": parse_timer_command})
+    stream_fixture(detector)
+
+    intent, slots, _ = detector.confirm("set a timer for five minutes and ten seconds")
+    assert intent == "set_timer"
+    assert slots is None
+
+
+def test_confirm_starts_over_when_the_intent_changed():
+    detector = EarlyIntentDetector({"set_timer": parse_timer_command})
+    stream_fixture(detector)
+
+    intent, slots, prefetch = detector.confirm("play shape of you by ed sheeran")
+    assert intent == "play_song"
+    assert slots is None
+    assert prefetch is not detector.prefetch
+    assert detector.prefetch.cancelled
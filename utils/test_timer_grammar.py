@@ -0,0 +1,78 @@
+import pytest
+
+from utils.match_intent import match_intent
+from utils.timer_grammar import match_timer_intent, parse_timer_command
+
+
+@pytest.mark.parametrize("utterance, time, name, all_timers", [
+    # Single durations
+    ("set a timer for 5 minutes", 300, None, False),
+    ("set a timer for five hours", 18000, None, False),
+    ("set a timer for ninety seconds", 90, None, False),
+    ("timer for 5", 5, None, False),
+    ("start a 20 minute timer", 1200, None, False),
+    ("1.5 hours", 5400, None, False),
+    # Compound durations
+    ("set timer 1 hour 30 minutes", 5400, None, False),
+    ("1 hour 30", 5400, None, False),
+    ("2h30m", 9000, None, False),
+    ("twenty five minutes", 1500, None, False),
+    ("one hundred seconds", 100, None, False),
+    ("set a timer for one hundred twenty minutes", 7200, None, False),
+    ("one hundred twenty five seconds", 125, None, False),
+    # Fractions
+    ("an hour and a half", 5400, None, False),
+    ("an hour and a half please", 5400, None, False),
+    ("one and a half hours", 5400, None, False),
+    ("2 and a half minutes", 150, None, False),
+    ("half an hour", 1800, None, False),
+    ("a half hour", 1800, None, False),
+    ("a quarter of an hour", 900, None, False),
+    ("three quarters of an hour", 2700, None, False),
+    # Names
+    ("set a pasta timer for 12 minutes", 720, "pasta", False),
+    ("set an egg timer for 7 minutes", 420, "egg", False),
+    ("start a timer called laundry for 40 minutes", 2400, "laundry", False),
+    ("timer named tea for three minutes", 180, "tea", False),
+    ("set a timer called big pasta", None, "big pasta", False),
+    # Stop arguments
+    ("stop the pasta timer", None, "pasta", False),
+    ("cancel all timers", None, None, True),
+    ("stop timer", None, None, False),
+    ("stop the clock", None, None, False),
+])
+def test_parse_timer_command(utterance, time, name, all_timers):
+    details = parse_timer_command(utterance)
+    assert (details["time"], details["name"], details["all"]) == (time, name, all_timers)
+
+
+@pytest.mark.parametrize("utterance, intent", [
+    ("set a timer for 5 minutes", "set_timer"),
+    ("start the clock for 45 seconds", "set_timer"),
+    ("set a pasta timer for twenty five minutes", "set_timer"),
+    ("stop", "stop_timer"),
+    ("stop the clock", "stop_timer"),
+    ("stop timing", "stop_timer"),
+    ("cancel all timers", "stop_timer"),
+    ("stop the pasta timer", "stop_timer"),
+    # Not timer commands, left to the general matcher
+    ("play shape of you by ed sheeran", None),
+    ("what time is it", None),
+    ("add a meeting at 3 o'clock tomorrow", None),
+    ("add a meeting at 3 o clock tomorrow", None),
+    ("schedule a meeting with john at four o'clock", None),
+    ("remind me to call mom at 6 o'clock", None),
+    ("remind me to stop by the clock shop", None),
+])
+def test_match_timer_intent(utterance, intent):
+    assert match_timer_intent(utterance) == intent
+
+
+@pytest.mark.parametrize("utterance", [
+    "add a meeting at 3 o'clock tomorrow",
+    "schedule a meeting with john at four o'clock",
+    "remind me to call mom at 6 o'clock",
+    "remind me to stop by the clock shop",
+])
+def test_calendar_commands_mentioning_clocks_are_not_timers(utterance):
+    assert match_intent(utterance) == "add_calendar"
@@ -0,0 +1,61 @@
+import gzip
+import json
+import os
+
+from utils.transcript_log import TranscriptLog
+
+RECORDS = 200
+
+
+def write_records(path, **options):
+    log = TranscriptLog(path, batch_size=5, flush_interval=0.01, max_bytes=500, **options)
+    for n in range(RECORDS):
+        log.log(utterance=f"set a timer for {n} minutes", n=n)
+    log.close()
+    return log
+
+
+def read_segments(path):
+    """
+    Returns the rotated segments, oldest first, and the numbers of all records, in the order written.
+    """
+    directory, name = os.path.split(path)
+    segments = sorted(f for f in os.listdir(directory) if f.startswith(name + "."))
+
+    lines = []
+    for segment in segments:
+        with gzip.open(os.path.join(directory, segment), "rt") as f:
+            lines.extend(f)
+    with open(path) as f:
+        lines.extend(f)
+    return segments, [json.loads(line)["n"] for line in lines]
+
+
+def test_every_record_is_written_by_close(tmp_path):
+    path = os.path.join(tmp_path, "transcripts.jsonl")
+    log = write_records(path, backups=RECORDS)
+
+    segments, numbers = read_segments(path)
+    assert log.dropped == 0
+    assert len(segments) > 1
+    assert all(segment.endswith(".gz") for segment in segments)
+    assert numbers == list(range(RECORDS))
+
+
+def test_only_the_newest_segments_are_kept(tmp_path):
+    path = os.path.join(tmp_path, "transcripts.jsonl")
+    write_records(path, backups=2)
+
+    segments, numbers = read_segments(path)
+    assert len(segments) == 2
+    # The pruned segments were the oldest, so what is left runs up to the last record
+    assert numbers == list(range(numbers[0], RECORDS))
+
+
+def test_records_after_close_are_ignored(tmp_path):
+    path = os.path.join(tmp_path, "transcripts.jsonl")
+    log = write_records(path, backups=RECORDS)
+    log.log(utterance="too late", n=RECORDS)
+
+    _, numbers = read_segments(path)
+    assert numbers == list(range(RECORDS))
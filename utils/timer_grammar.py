@@ -0,0 +1,199 @@
+import re
+
+# Splits text into numbers and words in one pass. "2h30m" becomes "2", "h", "30", "m",
+# and "o'clock" stays one word.
+_TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)?|[a-z]+(?:'[a-z]+)*")
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60,
+    "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100,
+}
+
+# Unit words and their length in seconds
+UNITS = {
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+}
+
+# The unit a bare number after another unit is in, as in "1 hour 30" or "5 minutes 10"
+_NEXT_SMALLER_UNIT = {3600: 60, 60: 1, 1: 1}
+
+FRACTIONS = {"half": 0.5, "quarter": 0.25, "quarters": 0.25}
+ARTICLES = {"a", "an"}
+
+# Words that continue a duration without changing it, as in "an hour and a half"
+CONNECTORS = {"and", "of"}
+
+TIMER_WORDS = {"timer", "timers", "countdown", "timing"}
+NAMING_WORDS = {"called", "named"}
+START_WORDS = {"start", "set", "run", "restart"}
+STOP_WORDS = {"stop", "cancel", "end", "kill", "clear", "dismiss", "off"}
+
+# "clock" only means a timer right after a start or stop word, as in "stop the clock",
+# and not in "the clock shop" or "four o clock"
+_CLOCK_VERBS = START_WORDS | STOP_WORDS
+ALL_WORDS = {"all", "every", "timers"}
+
+# Words before "timer" that are not its name, as in "set a new timer" or "stop my timer"
+_NOT_NAMES = {
+    "a", "an", "the", "my", "this", "that", "new", "set", "start", "make", "stop", "cancel",
+    "end", "kill", "clear", "dismiss", "all", "every", "for", "and", "of", "please", "another",
+} | set(UNITS) | set(NUMBER_WORDS) | set(FRACTIONS)
+
+
+def parse_timer_command(text):
+    """
+    Parses the duration, name and scope of a timer command in a single pass over its tokens.
+
+    Handles compound and worded durations such as "1 hour 30 minutes", "an hour and a half",
+    "ninety seconds", "half an hour" and "2h30m", and timer names such as "the pasta timer"
+    or "a timer called laundry".
+
+    Args:
+        text (str): The text input provided by the user.
+
+    Returns:
+        dict: "time" (int seconds, or None if no duration was found), "name" (str or None),
+              "all" (bool, whether the command refers to every timer) and "mentions_timer"
+              (bool, whether a timer word such as "timer", "countdown" or "stop the clock"
+              was used).
+    """
+    total = 0.0
+    found_duration = False
+    value = None             # The number being read, e.g. 25 after "twenty five"
+    value_is_article = False  # Whether value is the 1 implied by "a" or "an"
+    value_is_words = False   # Whether value was spelled out, so "hundred twenty" can add up
+    fraction = 0.0           # A pending "half" or "quarter"
+    last_unit = None
+    name_words = []
+    naming = False
+    previous = None
+    before_previous = None
+    all_timers = False
+    mentions_timer = False
+
+    def flush():
+        # Apply whatever is pending when the duration phrase ends
+        nonlocal total, found_duration, value, value_is_article, value_is_words, fraction
+        if fraction and last_unit:
+            # "an hour and a half": the fraction refers back to the last unit
+            total += fraction * last_unit
+            found_duration = True
+        elif value is not None and not value_is_article:
+            # "1 hour 30" or a bare "5", which is read as seconds
+            total += value * (_NEXT_SMALLER_UNIT[last_unit] if last_unit else 1)
+            found_duration = True
+        value = None
+        value_is_article = False
+        value_is_words = False
+        fraction = 0.0
+
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token[0].isdigit() or token in NUMBER_WORDS:
+            is_words = not token[0].isdigit()
+            number = NUMBER_WORDS[token] if is_words else float(token)
+            naming = False
+            if value is None or value_is_article:
+                value = number
+            elif is_words and value_is_words and number == 100:
+                value *= number  # "one hundred"
+            elif is_words and value_is_words and value and value % 100 == 0 and number < 100:
+                value += number  # "one hundred twenty"
+            elif is_words and value_is_words and value % 100 >= 20 and value % 10 == 0 and number < 10:
+                value += number  # "twenty five"
+            else:
+                flush()
+                value = number
+            value_is_article = False
+            value_is_words = is_words
+        elif token in ARTICLES:
+            if value is None and not fraction:
+                value = 1
+                value_is_article = True
+        elif token in FRACTIONS:
+            naming = False
+            if token == "quarters" and value is not None and not value_is_article:
+                fraction = value * FRACTIONS[token]  # "three quarters"
+                value = None
+            else:
+                fraction = FRACTIONS[token]
+                if value_is_article:
+                    value = None  # "a half", but keep the 1 in "one and a half"
+            value_is_article = False
+            value_is_words = False
+        elif token in UNITS:
+            naming = False
+            if value is not None or fraction:
+                last_unit = UNITS[token]
+                total += ((value or 0) + fraction) * last_unit
+                found_duration = True
+                value = None
+                value_is_article = False
+                value_is_words = False
+                fraction = 0.0
+        elif token in CONNECTORS:
+            naming = False
+        else:
+            flush()
+            commands_clock = token == "clock" and (
+                previous in _CLOCK_VERBS or (previous == "the" and before_previous in _CLOCK_VERBS)
+            )
+            if token in TIMER_WORDS or commands_clock:
+                mentions_timer = True
+                naming = False
+                if token == "timers":
+                    all_timers = True
+                # "the pasta timer": the word before "timer" is its name
+                if not name_words and previous is not None and previous not in _NOT_NAMES:
+                    name_words.append(previous)
+            elif token in NAMING_WORDS:
+                naming = True
+                name_words = []
+            elif token == "for":
+                naming = False
+            elif naming and token != "please":
+                # "a timer called laundry": the words after "called" are its name
+                name_words.append(token)
+            elif token in ALL_WORDS:
+                all_timers = True
+
+        before_previous = previous
+        previous = token
+    flush()
+
+    return {
+        "time": int(round(total)) if found_duration and total > 0 else None,
+        "name": " ".join(name_words) or None,
+        "all": all_timers,
+        "mentions_timer": mentions_timer,
+    }
+
+
+def match_timer_intent(text):
+    """
+    Recognises timer commands without fuzzy matching or any NLP model.
+
+    A command is "stop_timer" if it uses a stop word together with a timer word (or is
+    just a stop word), and "set_timer" if it mentions a timer and contains a duration.
+    "clock" is only a timer word right after a start or stop word, as in "stop the clock".
+
+    Args:
+        text (str): The text input provided by the user.
+
+    Returns:
+        str: "set_timer", "stop_timer", or None if the text is not clearly a timer command.
+    """
+    words = _TOKEN_PATTERN.findall(text.lower())
+    if not words:
+        return None
+
+    details = parse_timer_command(text)
+    if STOP_WORDS.intersection(words) and (details["mentions_timer"] or len(words) == 1):
+        return "stop_timer"
+    if details["mentions_timer"] and details["time"]:
+        return "set_timer"
+    return None
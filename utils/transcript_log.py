@@ -0,0 +1,169 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+
+TRANSCRIPT_LOG_PATH = os.getenv(
+    "ASSISTANT_TRANSCRIPT_LOG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "transcripts.jsonl"),
+)
+
+
+class TranscriptLog:
+    """
+    JSONL log of transcripts written by a background thread.
+
+    Records are queued in memory and written in batches, so logging never blocks the caller.
+    If the queue is full, new records are dropped and counted rather than waited on. The
+    file is rotated when it gets too large or too old, and rotated segments can be gzipped.
+    Everything still queued is written when the log is closed, including at interpreter exit.
+    """
+
+    def __init__(self, path, max_queue=1000, batch_size=100, flush_interval=1.0,
+                 max_bytes=5 * 1024 * 1024, max_age=24 * 60 * 60, backups=5, compress=True):
+        """
+        Initializes the TranscriptLog.
+
+        Args:
+            path (str): The file to write records to.
+            max_queue (int): Maximum number of records waiting to be written.
+            batch_size (int): Maximum number of records written at once.
+            flush_interval (float): Maximum seconds a record waits before being written.
+            max_bytes (int): Rotate the file once it is at least this large.
+            max_age (float): Rotate the file once its first record is this many seconds old.
+            backups (int): Number of rotated segments to keep.
+            compress (bool): Whether to gzip rotated segments.
+        """
+        # Absolute, so that a bare filename still has a directory to create and list
+        self.path = os.path.abspath(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.compress = compress
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._file = None
+        self._opened_at = None
+
+    def log(self, **record):
+        """
+        Queues a record to be written. Never blocks.
+
+        Args:
+            **record: The fields of the record, e.g. utterance, intent, slots, latency_ms, outcome.
+        """
+        if self._closed.is_set():
+            return
+        if self._thread is None:
+            self._start()
+
+        record = {"time": datetime.now().isoformat(timespec="milliseconds"), **record}
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Writes every queued record, closes the file and stops the writer thread.
+        """
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="transcript-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        # Write batches until closed, then drain whatever is left
+        while not (self._closed.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(batch)
+            except OSError as e:
+                print(f"Could not write transcript log: {e}")
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, batch):
+        if self._file is None:
+            self._open()
+
+        # Also checked right after opening, for a segment left over from an earlier run
+        if self._file.tell() > 0 and (
+            self._file.tell() >= self.max_bytes or time.time() - self._opened_at >= self.max_age
+        ):
+            self._rotate()
+            self._open()
+
+        self._file.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+        self._file.flush()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._opened_at = self._started_at()
+        self._file = open(self.path, "a")
+
+    def _started_at(self):
+        """
+        Returns when the current segment was started, so that age rotation carries over restarts.
+
+        This is the time of the segment's first record, since neither mtime nor ctime keep the
+        creation time of a file that is appended to. Falls back to now for a new file.
+        """
+        try:
+            with open(self.path) as f:
+                first_line = f.readline()
+            return datetime.fromisoformat(json.loads(first_line)["time"]).timestamp()
+        except (OSError, ValueError, KeyError, TypeError):
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return time.time()
+            return getattr(stat, "st_birthtime", min(stat.st_mtime, stat.st_ctime))
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+
+        rotated = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotated)
+
+        # Timestamps sort chronologically, so the oldest segments come first
+        directory, name = os.path.split(self.path)
+        segments = sorted(f for f in os.listdir(directory) if f.startswith(name + "."))
+        for segment in segments[:-self.backups] if self.backups > 0 else segments:
+            os.remove(os.path.join(directory, segment))
+
+
+transcript_log = TranscriptLog(TRANSCRIPT_LOG_PATH)
@@ -1,20 +1,57 @@
+import queue
+import threading
+
 import pyttsx3
 import spacy
 
 nlp = spacy.load("en_core_web_sm")
 
-engine = pyttsx3.init()
+# Everything to be spoken, as (text, done) pairs. A single thread owns the engine, since
+# pyttsx3 cannot run two runAndWait loops at once and must not block the GUI thread.
+_speech_queue = queue.Queue()
+_speaker = None
+_speaker_lock = threading.Lock()
+
+
+def _speak_queued():
+    engine = None
+    while True:
+        command, done = _speech_queue.get()
+        try:
+            if engine is None:
+                engine = pyttsx3.init()
+            engine.say(command)
+            engine.runAndWait()
+        except Exception as e:
+            # Never let a driver error end the thread, or every later caller would wait forever.
+            # The engine is created again for the next text in case it was left in a bad state.
+            print(f"Could not speak: {e}")
+            engine = None
+        finally:
+            done.set()
 
 
-def speak_out_loud(command):
+def speak_out_loud(command, wait=True):
     """
     Converts a given text command into spoken words using a text-to-speech engine.
 
+    The text is queued for the speaker thread, so it is safe to call from any thread and
+    never speaks over another call.
+
     Args:
         command (str): The text to be spoken.
+        wait (bool): Whether to block until the text has been spoken. Pass False from the GUI thread.
 
     Returns:
         None
     """
-    engine.say(command)
-    engine.runAndWait()
\ No newline at end of file
+    global _speaker
+    with _speaker_lock:
+        if _speaker is None or not _speaker.is_alive():
+            _speaker = threading.Thread(target=_speak_queued, name="speaker", daemon=True)
+            _speaker.start()
+
+    done = threading.Event()
+    _speech_queue.put((command, done))
+    if wait:
+        done.wait()
\ No newline at end of file